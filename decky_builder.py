@@ -6,10 +6,50 @@ from pathlib import Path
 import sys
 import time
 import PyInstaller
-import atexit
 import requests
 import psutil
 import re
+import stat
+import hashlib
+import mmap
+import threading
+import uuid
+import tarfile
+import http.client
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# shutil only uses a 1 MB buffer on Windows; the remaining copy2/copytree
+# fallbacks move ~30 MB executables, so use fewer, larger reads/writes
+if os.name == 'nt':
+    shutil.COPY_BUFSIZE = 16 * 1024 * 1024
+
+# Exact pnpm release the frontend is built with; check_dependencies installs it
+# globally when pnpm is missing or reports a different version
+PNPM_VERSION = "9.15.0"
+
+# Runs the release's own backend/pyinstaller.spec, so its Analysis (datas,
+# hiddenimports, ...) always matches the release being built, but makes its EXE
+# build both executables from that one Analysis/PYZ instead of re-running
+# PyInstaller per DECKY_NOCONSOLE
+PLUGIN_LOADER_SPEC = """\
+import os
+import PyInstaller.building.api as api
+
+_EXE = api.EXE
+
+def EXE(*args, **kwargs):
+    for name, console in [('PluginLoader', True), ('PluginLoader_noconsole', False)]:
+        _EXE(*args, **dict(kwargs, name=name, console=console))
+
+api.EXE = EXE
+try:
+    with open(os.path.join(SPECPATH, 'pyinstaller.spec')) as f:
+        exec(compile(f.read(), f.name, 'exec'))
+finally:
+    api.EXE = _EXE
+"""
 
 class DeckyBuilder:
     def __init__(self, release: str = None):
@@ -19,8 +59,12 @@ class DeckyBuilder:
         self.src_dir = self.root_dir / "src"
         self.dist_dir = self.root_dir / "dist"
         self.homebrew_dir = self.dist_dir / "homebrew"
-        self.temp_files = []  # Track temporary files for cleanup
-        atexit.register(self.cleanup)  # Register cleanup on exit
+        self._cache_dir = Path.home() / ".cache" / "decky_builder"  # Persists across runs
+        self._deletion_threads = []  # Background deletions started by _async_rmtree
+        self._versions = {}  # Memoized --version output, keyed by resolved executable path
+        self.release_manifest = self.app_dir / ".release.manifest"  # Release and file list of a tarball extraction
+        self.reuse_checkout = False  # Set by setup_directories when app_dir is already at self.release
+        self.artifacts_installed = False  # Set once the executables are copied out of dist
         
         # Setup user homebrew directory
         self.user_home = Path.home()
@@ -34,28 +78,23 @@ class DeckyBuilder:
             "themes"
         ]
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # cleanup() deletes dist/, so only run it once the build succeeded or its
+        # executables were already installed; a failed build keeps them for inspection
+        if exc_type is None or self.artifacts_installed:
+            self.cleanup()
+        self._join_deletion_threads()
+        return False
+
     def cleanup(self):
         """Clean up temporary files and directories"""
         try:
-            # Clean up any temporary files we created
-            for temp_file in self.temp_files:
-                if os.path.exists(temp_file):
-                    try:
-                        if os.path.isfile(temp_file):
-                            os.remove(temp_file)
-                        elif os.path.isdir(temp_file):
-                            shutil.rmtree(temp_file, ignore_errors=True)
-                    except Exception as e:
-                        print(f"Warning: Failed to remove temporary file {temp_file}: {e}")
-
             # Clean up PyInstaller temp files
             for dir_name in ['build', 'dist']:
-                dir_path = self.root_dir / dir_name
-                if dir_path.exists():
-                    try:
-                        shutil.rmtree(dir_path, ignore_errors=True)
-                    except Exception as e:
-                        print(f"Warning: Failed to remove {dir_name} directory: {e}")
+                self.safe_remove_directory(self.root_dir / dir_name)
 
             # Clean up PyInstaller spec files
             for spec_file in self.root_dir.glob("*.spec"):
@@ -67,6 +106,79 @@ class DeckyBuilder:
         except Exception as e:
             print(f"Warning: Error during cleanup: {e}")
 
+    def _is_link(self, entry):
+        """Check whether a DirEntry is a symlink or a Windows junction/reparse point"""
+        if entry.is_symlink():
+            return True
+        if os.name == 'nt':
+            # Junctions (used by pnpm for node_modules) are not symlinks to
+            # is_symlink() on 3.11; their attributes come cached from the listing
+            attributes = entry.stat(follow_symlinks=False).st_file_attributes
+            return bool(attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+        return False
+
+    def _scandir_rmtree(self, path):
+        """Recursively delete a directory tree using cached os.scandir entries"""
+        with os.scandir(path) as it:
+            entries = list(it)
+        # Deleting in inode (NTFS file reference number) order avoids quadratic
+        # directory index updates on very large directories such as .git/objects;
+        # inode() can cost a stat on Windows, so only pay it when it matters
+        if len(entries) > 1000:
+            entries.sort(key=lambda entry: entry.inode())
+        for entry in entries:
+            if self._is_link(entry):
+                # Remove the link itself, never the tree it points to
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    os.rmdir(entry.path)  # Directory symlinks/junctions on Windows
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                self._scandir_rmtree(entry.path)
+                continue
+            try:
+                os.unlink(entry.path)
+            except PermissionError:
+                # Only clear the read-only bit (e.g. git pack files) when the
+                # plain unlink fails, instead of chmod'ing every file up front.
+                # On Windows chmod only toggles FILE_ATTRIBUTE_READONLY.
+                os.chmod(entry.path, stat.S_IWRITE)
+                os.unlink(entry.path)
+        try:
+            os.rmdir(path)
+        except PermissionError:
+            os.chmod(path, 0o777)
+            os.rmdir(path)
+
+    def _async_rmtree(self, path):
+        """Rename a directory out of the way and delete it on a background thread"""
+        if not path.exists():
+            return
+        # A same-volume rename is near-instant, the slow per-file deletion is not
+        trash = path.parent / f".trash-{uuid.uuid4().hex}"
+        try:
+            os.rename(path, trash)
+        except OSError as e:
+            print(f"Warning: Could not move {path} aside ({str(e)}), removing it in place...")
+            self.safe_remove_directory(path)
+            return
+
+        def remove():
+            try:
+                self._scandir_rmtree(trash)
+            except Exception as e:
+                print(f"Warning: Failed to remove {trash}: {str(e)}")
+
+        thread = threading.Thread(target=remove, daemon=True)
+        thread.start()
+        self._deletion_threads.append(thread)
+
+    def _join_deletion_threads(self):
+        """Give background deletions a brief chance to finish before exit"""
+        for thread in self._deletion_threads:
+            thread.join(timeout=0.5)
+
     def safe_remove_directory(self, path):
         """Safely remove a directory with retries for Windows"""
         max_retries = 3
@@ -75,18 +187,7 @@ class DeckyBuilder:
         for attempt in range(max_retries):
             try:
                 if path.exists():
-                    # On Windows, sometimes we need to remove .git directory separately
-                    git_dir = path / '.git'
-                    if git_dir.exists():
-                        for item in git_dir.glob('**/*'):
-                            if item.is_file():
-                                try:
-                                    item.chmod(0o777)  # Give full permissions
-                                    item.unlink()
-                                except:
-                                    pass
-                    
-                    shutil.rmtree(path, ignore_errors=True)
+                    self._scandir_rmtree(path)
                 return
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed to remove {path}: {str(e)}")
@@ -96,152 +197,365 @@ class DeckyBuilder:
                 else:
                     print(f"Warning: Could not fully remove {path}. Continuing anyway...")
 
+    def _fast_copytree(self, src, dst):
+        """Mirror a directory tree, using multi-threaded robocopy on Windows"""
+        if os.name == 'nt':
+            # /PURGE mirrors in one pass, so stale files in dst are removed
+            # without a separate rmtree. Exit codes 0-7 are success bitmasks.
+            result = subprocess.run([
+                "robocopy", str(src), str(dst),
+                "/E", "/PURGE", "/MT:16",
+                "/NFL", "/NDL", "/NJH", "/NJS", "/NP",
+                "/R:1", "/W:1"
+            ])
+            if result.returncode > 7:
+                raise Exception(f"robocopy failed copying {src} to {dst} (exit code {result.returncode})")
+        else:
+            shutil.copytree(src, dst, dirs_exist_ok=True)
+
+    def _fast_copy_file(self, src, dst):
+        """Copy a file, using the native CopyFile API on Windows"""
+        if os.name == 'nt':
+            try:
+                from win32file import CopyFile
+                CopyFile(str(src), str(dst), False)
+                return
+            except ImportError:
+                pass
+        shutil.copy2(src, dst)
+
+    def _link_file(self, src, dst):
+        """Hardlink a single file, replacing dst and falling back to a copy"""
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    def _hardlink_tree(self, src, dst):
+        """Materialize a read-only copy of a tree by hardlinking files instead of copying data"""
+        os.makedirs(dst, exist_ok=True)
+        if os.stat(src).st_dev != os.stat(dst).st_dev:
+            # Hardlinks can't cross volumes, copy the whole tree instead
+            self._fast_copytree(src, dst)
+            return
+
+        with os.scandir(src) as entries:
+            for entry in entries:
+                target = os.path.join(dst, entry.name)
+                if entry.is_symlink():
+                    # os.link would follow the symlink, so materialize its target like copytree does
+                    if entry.is_dir():
+                        self._hardlink_tree(entry.path, target)
+                    elif entry.is_file():
+                        shutil.copy2(entry.path, target)
+                    else:
+                        print(f"Warning: Skipping dangling symlink {entry.path}")
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    self._hardlink_tree(entry.path, target)
+                    continue
+                try:
+                    os.link(entry.path, target)
+                except FileExistsError:
+                    os.unlink(target)
+                    os.link(entry.path, target)
+                except OSError:
+                    shutil.copy2(entry.path, target)
+
     def setup_directories(self):
         """Setup directory structure"""
         print("Setting up directories...")
-        # Clean up any existing directories
-        if self.app_dir.exists():
-            self.safe_remove_directory(self.app_dir)
-        if self.src_dir.exists():
-            self.safe_remove_directory(self.src_dir)
-        if self.homebrew_dir.exists():
-            self.safe_remove_directory(self.homebrew_dir)
+        # Finish deleting trees left behind by an earlier run's background removal
+        for trash in self.root_dir.glob(".trash-*"):
+            self._async_rmtree(trash)
+
+        # Keep the previous checkout when it is already at the requested release;
+        # otherwise delete it in the background. src is always rebuilt from app,
+        # since _hardlink_tree never prunes stale (content-hashed) frontend bundles.
+        self.reuse_checkout = self.checkout_matches_release()
+        if self.reuse_checkout:
+            print(f"Reusing existing {self.release} checkout in {self.app_dir}")
+            self.reset_checkout()
+        else:
+            self._async_rmtree(self.app_dir)
+        self._async_rmtree(self.src_dir)
+
+        # safe_remove_directory skips missing directories
+        self.safe_remove_directory(self.homebrew_dir)
 
         # Create fresh directories
         self.src_dir.mkdir(parents=True, exist_ok=True)
         self.homebrew_dir.mkdir(parents=True, exist_ok=True)
 
+    def checkout_matches_release(self):
+        """Check whether app_dir is a tarball extraction or git checkout of exactly self.release"""
+        # The manifest is written after a complete extraction and starts with its release
+        if self.release_manifest.exists():
+            with open(self.release_manifest) as f:
+                return f.readline().strip() == self.release
+        # git may not be installed yet: check_dependencies runs after this
+        if not (self.app_dir / ".git").exists() or not shutil.which("git"):
+            return False
+        head = subprocess.run(
+            ["git", "-C", str(self.app_dir), "describe", "--tags", "--exact-match"],
+            capture_output=True, text=True
+        )
+        return head.returncode == 0 and head.stdout.strip() == self.release
+
+    def reset_checkout(self):
+        """Discard build outputs and local changes in a reused checkout"""
+        # node_modules is kept so pnpm install only has to verify it against the lockfile
+        if self.release_manifest.exists():
+            self.reset_extraction()
+            return
+        subprocess.run(["git", "-C", str(self.app_dir), "clean", "-fdx", "-e", "node_modules"], check=True)
+        subprocess.run(["git", "-C", str(self.app_dir), "reset", "--hard"], check=True)
+
+    def reset_extraction(self):
+        """Delete everything in a reused tarball extraction that the archive didn't contain"""
+        with open(self.release_manifest) as f:
+            extracted = set(f.read().splitlines()[1:])
+        for root, dirs, files in os.walk(self.app_dir):
+            relroot = os.path.relpath(root, self.app_dir)
+            for name in list(dirs):
+                relpath = Path(relroot, name).as_posix()
+                if name == "node_modules" or relpath not in extracted:
+                    dirs.remove(name)
+                    if name != "node_modules":
+                        self.safe_remove_directory(Path(root, name))
+            for name in files:
+                relpath = Path(relroot, name).as_posix()
+                if relpath not in extracted and Path(root, name) != self.release_manifest:
+                    os.remove(os.path.join(root, name))
+
     def setup_homebrew(self):
         """Setup homebrew directory structure"""
         print("Setting up homebrew directory structure...")
-        # Create dist directory
-        (self.homebrew_dir / "dist").mkdir(parents=True, exist_ok=True)
-
-        # Setup homebrew directory structure for both temp and user directories
-        print("Setting up homebrew directory structure...")
-        for directory in [self.homebrew_dir, self.user_homebrew_dir]:
-            if not directory.exists():
-                directory.mkdir(parents=True)
-            
-            for folder in self.homebrew_folders:
-                folder_path = directory / folder
-                if not folder_path.exists():
-                    folder_path.mkdir(parents=True)
+        # Create dist directory plus the folder layout for both temp and user
+        # homebrew directories; mkdir(exist_ok=True) avoids a separate exists() stat
+        paths = [self.homebrew_dir / "dist"] + [
+            directory / folder
+            for directory in [self.homebrew_dir, self.user_homebrew_dir]
+            for folder in self.homebrew_folders
+        ]
+        for path in paths:
+            path.mkdir(parents=True, exist_ok=True)
 
     def clone_repository(self):
         """Clone Decky Loader repository and checkout specific version"""
         print(f"\nCloning Decky Loader repository version: {self.release}")
         
         # Clean up existing directory
-        if os.path.exists(self.app_dir):
+        if os.path.exists(self.app_dir) and not self.reuse_checkout:
             print("Removing existing repository...")
             self.safe_remove_directory(self.app_dir)
         
+        repo_url = 'https://github.com/SteamDeckHomebrew/decky-loader.git'
+        git_config = ['-c', 'core.fscache=true', '-c', 'core.longpaths=true', '-c', 'protocol.version=2']
+
         try:
-            # Clone the repository
-            subprocess.run([
-                'git', 'clone', '--no-checkout',  # Don't checkout anything yet
-                'https://github.com/SteamDeckHomebrew/decky-loader.git',
-                str(self.app_dir)
-            ], check=True)
-            
-            os.chdir(self.app_dir)
-            
-            # Fetch all refs
-            subprocess.run(['git', 'fetch', '--all', '--tags'], check=True)
-            
-            # Try to checkout the exact version first
-            try:
-                subprocess.run(['git', 'checkout', self.release], check=True)
-            except subprocess.CalledProcessError:
-                # If exact version fails, try to find the commit for pre-releases
-                if '-pre' in self.release:
-                    # Get all tags and their commit hashes
-                    result = subprocess.run(
-                        ['git', 'ls-remote', '--tags', 'origin'],
-                        capture_output=True, text=True, check=True
-                    )
-                    
-                    # Find the commit hash for our version
-                    for line in result.stdout.splitlines():
-                        commit_hash, ref = line.split('\t')
-                        ref = ref.replace('refs/tags/', '')
-                        ref = ref.replace('^{}', '')  # Remove annotated tag suffix
-                        if ref == self.release:
-                            print(f"Found commit {commit_hash} for version {self.release}")
-                            subprocess.run(['git', 'checkout', commit_hash], check=True)
-                            break
-                    else:
-                        raise Exception(f"Could not find commit for version {self.release}")
+            if self.reuse_checkout:
+                print(f"Existing checkout is already at {self.release}, skipping clone")
+            else:
+                ref = self.release
+                if ref == 'main':
+                    ref = self.resolve_latest_tag(repo_url, git_config)
+                    print(f"Resolved main to newest tag: {ref}")
+                    # Label the build with the tag actually built: .loader.version, the
+                    # setup.py version and the cache key all derive from self.release
+                    self.release = ref
+                if self.download_source_archive(ref):
+                    print(f"Downloaded source archive for version: {ref}")
                 else:
-                    raise
+                    self.git_clone_release(repo_url, git_config, ref)
             
             print(f"Successfully checked out version: {self.release}")
             
-            # Create version files in key locations with the requested version
-            version_files = [
-                '.loader.version',
+            # Write the requested version once and hardlink it into the other key locations
+            version_file = self.app_dir / '.loader.version'
+            version_file.unlink(missing_ok=True)  # Never rewrite an inode that may be linked elsewhere
+            version_file.write_text(self.release)
+            for linked_file in [
                 'frontend/.loader.version',
                 'backend/.loader.version',
                 'backend/decky_loader/.loader.version'
-            ]
-            
-            for version_file in version_files:
-                file_path = os.path.join(self.app_dir, version_file)
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                with open(file_path, 'w') as f:
-                    f.write(self.release)  # Use the requested version
+            ]:
+                self._link_file(version_file, self.app_dir / linked_file)
             
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to clone/checkout repository: {str(e)}")
-        finally:
-            os.chdir(self.root_dir)
+
+    def download_source_archive(self, ref):
+        """Stream the GitHub tarball for a release tag into app_dir, returns False if it can't be fetched"""
+        url = f"https://codeload.github.com/SteamDeckHomebrew/decky-loader/tar.gz/refs/tags/{ref}"
+        print(f"Downloading source archive from {url}")
+        try:
+            response = urllib.request.urlopen(url, timeout=60)
+        except urllib.error.HTTPError as e:
+            print(f"No release tarball for {ref} (HTTP {e.code}), falling back to git clone...")
+            return False
+        except (urllib.error.URLError, OSError) as e:
+            print(f"Failed to download release tarball for {ref}: {str(e)}, falling back to git clone...")
+            return False
+
+        extracted = []
+
+        def strip_top_level(archive):
+            # GitHub archives nest everything under "decky-loader-<version>/"
+            for member in archive:
+                _, _, member.name = member.name.partition('/')
+                if member.islnk():
+                    _, _, member.linkname = member.linkname.partition('/')
+                if member.name:
+                    extracted.append(member.name.rstrip('/'))
+                    yield member
+
+        # Stream straight from the response, nothing is buffered to disk first
+        extract_kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+        try:
+            with response, tarfile.open(fileobj=response, mode='r|gz') as archive:
+                archive.extractall(self.app_dir, members=strip_top_level(archive), **extract_kwargs)
+        except (tarfile.TarError, http.client.HTTPException, OSError) as e:
+            print(f"Failed to extract release tarball for {ref}: {str(e)}, falling back to git clone...")
+            self.safe_remove_directory(self.app_dir)
+            return False
+
+        # Written last, so only a complete extraction can be reused by a later build
+        with open(self.release_manifest, 'w') as f:
+            f.write("\n".join([ref, *extracted]) + "\n")
+        return True
+
+    def git_clone_release(self, repo_url, git_config, ref):
+        """Shallow-clone ref, falling back to a full clone for refs --branch cannot resolve"""
+        reference = self.update_git_mirror(repo_url, git_config)
+        try:
+            # Shallow, single-ref clone: we only need the tree at one tag
+            subprocess.run([
+                'git', *git_config, 'clone',
+                '--depth', '1', '--single-branch', '--branch', ref,
+                '--filter=blob:none', '--no-tags', *reference,
+                repo_url, str(self.app_dir)
+            ], check=True)
+        except subprocess.CalledProcessError:
+            print(f"Shallow clone of {self.release} failed, falling back to a full clone...")
+            self.safe_remove_directory(self.app_dir)
+            self.full_clone_checkout(repo_url, git_config, reference)
+
+    def update_git_mirror(self, repo_url, git_config):
+        """Create or refresh a bare, blobless cache of the branches and tags, returns clone args referencing it"""
+        # Objects already in the cache aren't downloaded again; --dissociate copies
+        # what the clone needs so app_dir doesn't depend on the cache afterwards.
+        # Only commits and trees of heads and tags are kept: a --mirror clone would
+        # also pull every refs/pull/* head and all blobs before the shallow clone.
+        mirror = self._cache_dir / "decky-loader.git"
+        try:
+            if not mirror.exists():
+                print("Creating cached decky-loader repository...")
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                subprocess.run(['git', *git_config, 'clone', '--bare', '--filter=blob:none', repo_url, str(mirror)], check=True)
+            else:
+                print("Updating cached decky-loader repository...")
+            subprocess.run(['git', '-C', str(mirror), 'config', '--replace-all', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*'], check=True)
+            subprocess.run(['git', '-C', str(mirror), 'config', '--add', 'remote.origin.fetch', '+refs/tags/*:refs/tags/*'], check=True)
+            subprocess.run(['git', '-C', str(mirror), 'config', '--unset-all', 'remote.origin.mirror'])  # Set by older --mirror caches
+            subprocess.run(['git', *git_config, '-C', str(mirror), 'fetch', '--prune', 'origin'], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"Warning: Could not update git cache, cloning without it: {str(e)}")
+            return []
+        return ['--reference', str(mirror), '--dissociate']
+
+    def resolve_latest_tag(self, repo_url, git_config):
+        """Find the newest tag on the remote without cloning it"""
+        # versionsort.suffix sorts v3.1.0-pre1 before v3.1.0 instead of after it
+        result = subprocess.run(
+            ['git', *git_config, '-c', 'versionsort.suffix=-pre',
+             'ls-remote', '--tags', '--refs', '--sort=-v:refname', repo_url],
+            capture_output=True, text=True, check=True
+        )
+        for line in result.stdout.splitlines():
+            _, ref = line.split('\t')
+            return ref.replace('refs/tags/', '')
+        raise Exception(f"No tags found at {repo_url}")
+
+    def full_clone_checkout(self, repo_url, git_config, reference=()):
+        """Full clone fallback for refs that a shallow --branch clone cannot resolve"""
+        # Clone the repository
+        subprocess.run([
+            'git', *git_config, 'clone', '--no-checkout',  # Don't checkout anything yet
+            *reference,
+            repo_url,
+            str(self.app_dir)
+        ], check=True)
+        
+        # Fetch all refs
+        subprocess.run(['git', 'fetch', '--all', '--tags'], cwd=self.app_dir, check=True)
+        
+        # Try to checkout the exact version first
+        try:
+            subprocess.run(['git', 'checkout', self.release], cwd=self.app_dir, check=True)
+        except subprocess.CalledProcessError:
+            # If exact version fails, try to find the commit for pre-releases
+            if '-pre' in self.release:
+                # Get all tags and their commit hashes
+                result = subprocess.run(
+                    ['git', 'ls-remote', '--tags', 'origin'],
+                    cwd=self.app_dir, capture_output=True, text=True, check=True
+                )
+                
+                # Find the commit hash for our version
+                for line in result.stdout.splitlines():
+                    commit_hash, ref = line.split('\t')
+                    ref = ref.replace('refs/tags/', '')
+                    ref = ref.replace('^{}', '')  # Remove annotated tag suffix
+                    if ref == self.release:
+                        print(f"Found commit {commit_hash} for version {self.release}")
+                        subprocess.run(['git', 'checkout', commit_hash], cwd=self.app_dir, check=True)
+                        break
+                else:
+                    raise Exception(f"Could not find commit for version {self.release}")
+            else:
+                raise
 
     def build_frontend(self):
         """Build frontend files"""
         print("Building frontend...")
-        batch_file = None
-        original_dir = os.getcwd()
         
         try:
             frontend_dir = self.app_dir / "frontend"
             if not frontend_dir.exists():
                 raise Exception(f"Frontend directory not found at {frontend_dir}")
 
-            print(f"Changing to frontend directory: {frontend_dir}")
-            os.chdir(frontend_dir)
-
-            # Create .loader.version file with the release tag
-            version_file = frontend_dir / ".loader.version"
-            with open(version_file, "w") as f:
-                f.write(self.release)
-            self.temp_files.append(str(version_file))
-
-            # Create a batch file to run the commands
-            batch_file = frontend_dir / "build_frontend.bat"
-            with open(batch_file, "w") as f:
-                f.write("@echo off\n")
-                f.write("call pnpm install\n")
-                f.write("if %errorlevel% neq 0 exit /b %errorlevel%\n")
-                f.write("call pnpm run build\n")
-                f.write("if %errorlevel% neq 0 exit /b %errorlevel%\n")
-            self.temp_files.append(str(batch_file))
+            # Resolve from a persistent pnpm store so repeat builds mostly hardlink from cache
+            pnpm_store = self._cache_dir / "pnpm-store"
+            pnpm_store.mkdir(parents=True, exist_ok=True)
 
+            # Run pnpm directly via its resolved path (the .cmd shim on Windows)
+            # rather than through a batch file and a cmd.exe shell
+            pnpm = shutil.which("pnpm")
+            if not pnpm:
+                raise Exception("pnpm not found in PATH")
+
+            # Output is inherited rather than captured so progress streams live
+            # and a long build can't stall on a full pipe buffer
             print("Running build commands...")
-            result = subprocess.run([str(batch_file)], check=True, capture_output=True, text=True, shell=True)
-            print(result.stdout)
+            subprocess.run(
+                [pnpm, "install", "--frozen-lockfile", "--prefer-offline", f"--store-dir={pnpm_store}",
+                 "--config.side-effects-cache=true"],
+                cwd=frontend_dir, check=True
+            )
+            subprocess.run([pnpm, "run", "build"], cwd=frontend_dir, check=True)
 
         except subprocess.CalledProcessError as e:
             print(f"Command failed: {e.cmd}")
-            print(f"Output: {e.output}")
-            print(f"Error: {e.stderr}")
             raise Exception(f"Error building frontend: Command failed - {str(e)}")
         except Exception as e:
             print(f"Error building frontend: {str(e)}")
             raise
-        finally:
-            # Always return to original directory
-            os.chdir(original_dir)
 
     def prepare_backend(self):
         """Prepare backend files for building."""
@@ -251,23 +565,12 @@ class DeckyBuilder:
         # Create src directory if it doesn't exist
         os.makedirs(self.src_dir, exist_ok=True)
 
-        # Copy backend files from app/backend/decky_loader to src/decky_loader
+        # Copy backend files from app/backend/decky_loader to src/decky_loader.
+        # static, locales and plugin live inside decky_loader, so this one
+        # recursive pass already maintains the decky_loader structure.
         print("Copying backend files...")
-        shutil.copytree(os.path.join(self.app_dir, "backend", "decky_loader"), 
-                       os.path.join(self.src_dir, "decky_loader"), 
-                       dirs_exist_ok=True)
-
-        # Copy static, locales, and plugin directories to maintain decky_loader structure
-        os.makedirs(os.path.join(self.src_dir, "decky_loader"), exist_ok=True)
-        shutil.copytree(os.path.join(self.app_dir, "backend", "decky_loader", "static"),
-                       os.path.join(self.src_dir, "decky_loader", "static"),
-                       dirs_exist_ok=True)
-        shutil.copytree(os.path.join(self.app_dir, "backend", "decky_loader", "locales"),
-                       os.path.join(self.src_dir, "decky_loader", "locales"),
-                       dirs_exist_ok=True)
-        shutil.copytree(os.path.join(self.app_dir, "backend", "decky_loader", "plugin"),
-                       os.path.join(self.src_dir, "decky_loader", "plugin"),
-                       dirs_exist_ok=True)
+        self._hardlink_tree(os.path.join(self.app_dir, "backend", "decky_loader"),
+                           os.path.join(self.src_dir, "decky_loader"))
 
         # Create legacy directory
         os.makedirs(os.path.join(self.src_dir, "src", "legacy"), exist_ok=True)
@@ -276,10 +579,8 @@ class DeckyBuilder:
         shutil.copy2(os.path.join(self.app_dir, "backend", "main.py"),
                     os.path.join(self.src_dir, "main.py"))
 
-        # Create version file in the src directory
-        version_file = os.path.join(self.src_dir, ".loader.version")
-        with open(version_file, "w") as f:
-            f.write(self.release)
+        # Link the version file written by clone_repository into the src directory
+        self._link_file(self.app_dir / ".loader.version", self.src_dir / ".loader.version")
 
         print("Backend preparation completed successfully!")
         return True
@@ -292,10 +593,14 @@ class DeckyBuilder:
             requirements_file = self.app_dir / "backend" / "requirements.txt"
             pyproject_file = self.app_dir / "backend" / "pyproject.toml"
             
+            pip_install = [
+                sys.executable, "-m", "pip", "install", "--user",
+                "--no-input", "--disable-pip-version-check",
+                "--cache-dir", str(self._cache_dir / "pip")
+            ]
+            
             if requirements_file.exists():
-                subprocess.run([
-                    sys.executable, "-m", "pip", "install", "--user", "-r", str(requirements_file)
-                ], check=True)
+                subprocess.run([*pip_install, "-r", str(requirements_file)], check=True)
             elif pyproject_file.exists():
                 # Install core dependencies directly instead of using poetry
                 dependencies = [
@@ -312,21 +617,75 @@ class DeckyBuilder:
                     "pywin32>=303; platform_system == 'Windows'"
                 ]
                 
-                # Install each dependency
-                for dep in dependencies:
-                    try:
-                        subprocess.run([
-                            sys.executable, "-m", "pip", "install", "--user", dep
-                        ], check=True)
-                    except subprocess.CalledProcessError as e:
-                        print(f"Warning: Failed to install {dep}: {str(e)}")
-                        continue
+                # Install all dependencies in one pip run so they are resolved together
+                result = subprocess.run([*pip_install, *dependencies], check=False)
+                if result.returncode != 0:
+                    # pip installs nothing when any requirement fails, so retry one by
+                    # one to keep a single bad package from blocking all the others
+                    print(f"Warning: Batched install failed (pip exit code {result.returncode}), nothing was installed; retrying each dependency separately")
+                    for dep in dependencies:
+                        try:
+                            subprocess.run([*pip_install, dep], check=True)
+                        except subprocess.CalledProcessError as e:
+                            print(f"Warning: Failed to install {dep}: {str(e)}")
             else:
                 print("Warning: No requirements.txt or pyproject.toml found")
         except Exception as e:
             print(f"Error installing requirements: {str(e)}")
             raise
 
+    def _hash_file(self, path):
+        """Return the sha256 digest of a single file"""
+        with open(path, 'rb', buffering=0) as f:
+            if os.fstat(f.fileno()).st_size > 1024 * 1024:
+                # Hash large files straight from the page cache without a userspace copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return hashlib.sha256(mapped).digest()
+            return hashlib.file_digest(f, 'sha256').digest()
+
+    def _hash_inputs(self):
+        """Compute a content hash of the PyInstaller inputs used as the build cache key"""
+        files = []
+        links = []
+
+        def walk(directory):
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        # Hash the link itself; following it could hit a directory or loop
+                        links.append(entry.path)
+                    elif entry.is_dir(follow_symlinks=False):
+                        walk(entry.path)
+                    else:
+                        files.append(entry.path)
+
+        walk(self.src_dir)
+        files.sort()
+        links.sort()
+
+        # hashlib releases the GIL on large buffers, so threads hash in parallel
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            digests = list(executor.map(self._hash_file, files))
+
+        digest = hashlib.sha256(self.release.encode())
+        for path, file_digest in zip(files, digests):
+            digest.update(os.path.relpath(path, self.src_dir).encode())
+            digest.update(file_digest)
+        for path in links:
+            digest.update(os.path.relpath(path, self.src_dir).encode())
+            digest.update(os.readlink(path).encode())
+
+        # The spec and dependency manifests affect the output but live outside src
+        digest.update(PLUGIN_LOADER_SPEC.encode())
+        backend_dir = self.app_dir / "backend"
+        for name in ["pyinstaller.spec", "requirements.txt", "pyproject.toml"]:
+            manifest = backend_dir / name
+            if manifest.exists():
+                digest.update(name.encode())
+                digest.update(manifest.read_bytes())
+
+        return digest.hexdigest()
+
     def add_defender_exclusion(self, path):
         """Add Windows Defender exclusion for a path"""
         try:
@@ -371,7 +730,16 @@ class DeckyBuilder:
             
         print(f"Building version: {version} (Python package version: {py_version})")
         
-        original_dir = os.getcwd()
+        # Reuse executables from a previous build with identical inputs
+        exe_names = ["PluginLoader.exe", "PluginLoader_noconsole.exe"]
+        cache_entry = self._cache_dir / "builds" / self._hash_inputs()
+        if (cache_entry / ".complete").exists():
+            print(f"Using cached executables from {cache_entry}")
+            os.makedirs(os.path.join(self.root_dir, "dist"), exist_ok=True)
+            for exe_name in exe_names:
+                self._fast_copy_file(cache_entry / exe_name, os.path.join(self.root_dir, "dist", exe_name))
+            return
+        
         backend_dir = os.path.join(self.app_dir, "backend")
         dist_dir = os.path.join(backend_dir, "dist")
         
@@ -379,8 +747,6 @@ class DeckyBuilder:
         added_exclusion = self.add_defender_exclusion(backend_dir)
         
         try:
-            os.chdir(backend_dir)
-            
             # Create setup.py with the correct version
             setup_py = """
             from setuptools import setup, find_packages
@@ -406,53 +772,50 @@ class DeckyBuilder:
             )
             """ % py_version
 
-            with open("setup.py", "w") as f:
+            with open(os.path.join(backend_dir, "setup.py"), "w") as f:
                 f.write(setup_py)
                 
             # Install the package in development mode
-            subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."], check=True)
+            subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."], cwd=backend_dir, check=True)
+            
+            # Wrap the release's pyinstaller.spec so its one Analysis feeds both EXE
+            # targets; the wrapper is stable between runs so PyInstaller's cached steps stay valid
+            if not os.path.exists(os.path.join(backend_dir, "pyinstaller.spec")):
+                raise Exception("pyinstaller.spec not found in the release's backend directory")
+            with open(os.path.join(backend_dir, "PluginLoader.spec"), "w") as f:
+                f.write(PLUGIN_LOADER_SPEC)
             
-            # Common PyInstaller arguments
-            pyinstaller_args = [
+            # The work directory persists across runs (cleanup() leaves it alone)
+            # so PyInstaller can skip unchanged Analysis/PYZ steps, and executables
+            # go straight to the final dist.
+            output_dir = os.path.join(self.root_dir, "dist")
+            print("Building PluginLoader.exe and PluginLoader_noconsole.exe...")
+            subprocess.run([
                 sys.executable,
                 "-m",
                 "PyInstaller",
-                "--clean",
                 "--noconfirm",
-                "pyinstaller.spec"
-            ]
+                "--workpath", str(self.root_dir / ".pyinstaller_work"),
+                "--distpath", output_dir,
+                "PluginLoader.spec"
+            ], cwd=backend_dir, check=True)
             
-            # First build console version
-            print("Building PluginLoader.exe (console version)...")
-            os.environ.pop('DECKY_NOCONSOLE', None)  # Ensure env var is not set
-            subprocess.run(pyinstaller_args, check=True)
-            
-            # Then build no-console version
-            print("Building PluginLoader_noconsole.exe...")
-            os.environ['DECKY_NOCONSOLE'] = '1'
-            subprocess.run(pyinstaller_args, check=True)
-            
-            # Clean up environment
-            os.environ.pop('DECKY_NOCONSOLE', None)
-            
-            # Copy the built executables to dist
-            os.makedirs(os.path.join(self.root_dir, "dist"), exist_ok=True)
-            if os.path.exists(os.path.join("dist", "PluginLoader.exe")):
-                shutil.copy2(
-                    os.path.join("dist", "PluginLoader.exe"),
-                    os.path.join(self.root_dir, "dist", "PluginLoader.exe")
-                )
-            else:
-                raise Exception("PluginLoader.exe not found after build")
-                
-            if os.path.exists(os.path.join("dist", "PluginLoader_noconsole.exe")):
-                shutil.copy2(
-                    os.path.join("dist", "PluginLoader_noconsole.exe"),
-                    os.path.join(self.root_dir, "dist", "PluginLoader_noconsole.exe")
-                )
-            else:
-                raise Exception("PluginLoader_noconsole.exe not found after build")
+            for exe_name in exe_names:
+                if not os.path.exists(os.path.join(output_dir, exe_name)):
+                    raise Exception(f"{exe_name} not found after build")
                 
+            # Store the executables for future builds with the same inputs. The entry is
+            # assembled under a temporary name and renamed into place once complete, so
+            # an interrupted copy can never be mistaken for a cache hit.
+            staging = cache_entry.with_name(f".tmp-{uuid.uuid4().hex}")
+            staging.mkdir(parents=True)
+            for exe_name in exe_names:
+                self._fast_copy_file(os.path.join(output_dir, exe_name), staging / exe_name)
+            (staging / ".complete").touch()
+            if cache_entry.exists():
+                self.safe_remove_directory(cache_entry)  # Left over from an interrupted run
+            os.replace(staging, cache_entry)
+            
             print("Successfully built executables")
             
         except subprocess.CalledProcessError as e:
@@ -460,7 +823,6 @@ class DeckyBuilder:
         finally:
             if added_exclusion:
                 self.remove_defender_exclusion(backend_dir)
-            os.chdir(original_dir)
 
     def install_files(self):
         """Install files to homebrew directory"""
@@ -478,12 +840,11 @@ class DeckyBuilder:
                 exe_dest = os.path.join(services_dir, exe_name)
                 if not os.path.exists(exe_source):
                     raise Exception(f"{exe_name} not found at {exe_source}")
-                shutil.copy2(exe_source, exe_dest)
+                self._fast_copy_file(exe_source, exe_dest)
             
-            # Create .loader.version file
-            version_file = os.path.join(services_dir, ".loader.version")
-            with open(version_file, "w") as f:
-                f.write(self.release)
+            # Create .loader.version file. This is written rather than linked: a link
+            # would let a later build rewrite the installed version in place.
+            Path(services_dir, ".loader.version").write_text(self.release)
             
             print("Successfully installed files")
             
@@ -494,18 +855,21 @@ class DeckyBuilder:
         """Install Node.js v18.18.0 with npm"""
         print("Installing Node.js v18.18.0...")
         try:
-            # First check if Node.js v18.18.0 is already installed in common locations
+            # First check if Node.js v18.18.0 is already on PATH or installed in common locations
             nodejs_paths = [
                 r"C:\Program Files\nodejs\node.exe",
                 r"C:\Program Files (x86)\nodejs\node.exe",
                 os.path.expandvars(r"%APPDATA%\Local\Programs\nodejs\node.exe")
             ]
+            node_on_path = shutil.which("node")
+            if node_on_path:
+                nodejs_paths.insert(0, node_on_path)
 
             # Try to use existing Node.js 18.18.0 first
             for node_path in nodejs_paths:
                 if os.path.exists(node_path):
                     try:
-                        version = subprocess.run([node_path, "--version"], capture_output=True, text=True).stdout.strip()
+                        version = self._version(node_path)
                         if version.startswith("v18.18.0"):
                             print(f"Found Node.js {version} at {node_path}")
                             node_dir = os.path.dirname(node_path)
@@ -518,43 +882,47 @@ class DeckyBuilder:
             # If we get here, we need to install Node.js 18.18.0
             print("Installing Node.js v18.18.0...")
             
-            # Create temp directory for downloads
-            temp_dir = self.root_dir / "temp"
-            temp_dir.mkdir(exist_ok=True)
+            # Keep the installer in the user cache so it survives between runs
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
             
-            # Download Node.js installer
-            node_installer = temp_dir / "node-v18.18.0-x64.msi"
-            if not node_installer.exists():
+            # Download Node.js installer, reusing the cached copy only if it verifies.
+            # Silent install is only safe for an installer we have verified.
+            node_installer = self._cache_dir / "node-v18.18.0-x64.msi"
+            if node_installer.exists() and self.verify_node_installer(node_installer):
+                print(f"Using cached Node.js installer at {node_installer}")
+            else:
+                if node_installer.exists():
+                    print("Cached Node.js installer failed verification, downloading a fresh copy...")
+                    node_installer.unlink()
                 print("Downloading Node.js installer...")
                 try:
-                    import urllib.request
-                    urllib.request.urlretrieve(
+                    self.download_file(
                         "https://nodejs.org/dist/v18.18.0/node-v18.18.0-x64.msi",
                         node_installer
                     )
                 except Exception as e:
                     print(f"Error downloading Node.js installer: {str(e)}")
                     raise
+                if not self.verify_node_installer(node_installer):
+                    # Drop the bad download so the next run fetches a fresh copy
+                    node_installer.unlink()
+                    raise Exception(f"Checksum mismatch for downloaded {node_installer.name}")
 
             # Install Node.js silently
             print("Installing Node.js (this may take a few minutes)...")
             try:
-                # First try to uninstall any existing Node.js using PowerShell
-                uninstall_cmd = 'Get-WmiObject -Class Win32_Product | Where-Object { $_.Name -like "*Node.js*" } | ForEach-Object { $_.Uninstall() }'
-                subprocess.run(["powershell", "-Command", uninstall_cmd], capture_output=True, timeout=60)
-                
-                # Wait a bit for uninstallation to complete
-                time.sleep(5)
+                # First try to uninstall any existing Node.js. msiexec is synchronous
+                # and only exits once the MSI transaction has committed, so no wait
+                self.uninstall_nodejs()
                 
                 # Now install Node.js 18.18.0
                 subprocess.run(
-                    ["msiexec", "/i", str(node_installer), "/qn", "ADDLOCAL=ALL"],
+                    ["msiexec", "/i", str(node_installer), "/qn", "/norestart", "ADDLOCAL=ALL"],
                     check=True,
                     timeout=300  # 5 minute timeout
                 )
-                
-                print("Waiting for Node.js installation to complete...")
-                time.sleep(10)
+                # Versions probed before the install are stale now
+                self._versions.clear()
                 
                 # Add to PATH
                 nodejs_path = r"C:\Program Files\nodejs"
@@ -566,16 +934,20 @@ class DeckyBuilder:
                 if npm_path not in os.environ["PATH"]:
                     os.environ["PATH"] = npm_path + os.pathsep + os.environ["PATH"]
                 
+                # msiexec has already committed the install; briefly poll in case
+                # node isn't resolvable yet rather than sleeping a fixed interval
+                deadline = time.monotonic() + 3
+                while not shutil.which("node") and time.monotonic() < deadline:
+                    time.sleep(0.25)
+                
                 # Verify installation
-                node_version = subprocess.run(["node", "--version"], capture_output=True, text=True, check=True).stdout.strip()
+                node_version = self._version("node")
                 if not node_version.startswith("v18.18.0"):
                     raise Exception(f"Wrong Node.js version installed: {node_version}")
                 
-                npm_version = subprocess.run(["npm", "--version"], capture_output=True, text=True, check=True).stdout.strip()
+                npm_version = self._version("npm")
                 print(f"Successfully installed Node.js {node_version} with npm {npm_version}")
                 
-                # Clean up
-                self.safe_remove_directory(temp_dir)
                 return True
                 
             except subprocess.TimeoutExpired:
@@ -589,6 +961,88 @@ class DeckyBuilder:
             print(f"Error installing Node.js: {str(e)}")
             raise
 
+    def uninstall_nodejs(self):
+        """Uninstall existing Node.js MSI installs found in the registry Uninstall keys"""
+        # Walking the Uninstall keys is far cheaper than Win32_Product, which
+        # runs an MSI consistency check on every installed product
+        import winreg
+        uninstall_keys = [
+            r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+            r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+        ]
+        product_codes = set()
+        for uninstall_key in uninstall_keys:
+            try:
+                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, uninstall_key)
+            except OSError:
+                continue
+            with key:
+                for i in range(winreg.QueryInfoKey(key)[0]):
+                    product_code = winreg.EnumKey(key, i)
+                    try:
+                        with winreg.OpenKey(key, product_code) as product:
+                            display_name = winreg.QueryValueEx(product, "DisplayName")[0]
+                    except OSError:
+                        continue
+                    # MSI installs are keyed by their {ProductCode}
+                    if "Node.js" in display_name and product_code.startswith("{"):
+                        product_codes.add(product_code)
+
+        for product_code in product_codes:
+            print(f"Uninstalling existing Node.js {product_code}...")
+            subprocess.run(["msiexec", "/x", product_code, "/qn", "/norestart"], capture_output=True, timeout=300)
+
+    def download_file(self, url, dest, max_retries=3):
+        """Download url to dest in 1 MB chunks, resuming a partial download on retry"""
+        # Download to a partial file so an interrupted run can't poison the cache
+        partial = Path(f"{dest}.part")
+        for attempt in range(max_retries):
+            existing_size = partial.stat().st_size if partial.exists() else 0
+            headers = {"Range": f"bytes={existing_size}-"} if existing_size else {}
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60) as response:
+                    # A 200 means the server ignored the Range header, start over
+                    mode = "ab" if response.status == 206 else "wb"
+                    with open(partial, mode) as f:
+                        shutil.copyfileobj(response, f, length=1 << 20)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code == 416 and existing_size:
+                    break  # Range not satisfiable: the partial file is already complete
+                raise
+            except (http.client.IncompleteRead, urllib.error.URLError, ConnectionError, TimeoutError) as e:
+                print(f"Download attempt {attempt + 1} of {url} interrupted: {str(e)}")
+                if attempt == max_retries - 1:
+                    raise
+        os.replace(partial, dest)
+
+    def verify_node_installer(self, node_installer):
+        """Check the Node.js installer against the SHA256 published by nodejs.org, returns True if it matches"""
+        expected = self.published_node_installer_digest(node_installer)
+        actual = self._hash_file(node_installer).hex()
+        if actual != expected:
+            print(f"Checksum mismatch for {node_installer.name}: expected {expected}, got {actual}")
+            return False
+        return True
+
+    def published_node_installer_digest(self, node_installer):
+        """Return the digest nodejs.org publishes for the installer, saved beside it so later runs work offline"""
+        saved = node_installer.with_name(f"{node_installer.name}.sha256")
+        try:
+            return saved.read_text().strip()
+        except FileNotFoundError:
+            pass
+
+        shasums_url = "https://nodejs.org/dist/v18.18.0/SHASUMS256.txt"
+        with urllib.request.urlopen(shasums_url, timeout=30) as response:
+            shasums = response.read().decode()
+        for line in shasums.splitlines():
+            digest, _, filename = line.partition("  ")
+            if filename.strip() == node_installer.name:
+                saved.write_text(digest)
+                return digest
+        raise Exception(f"No published checksum for {node_installer.name} in {shasums_url}")
+
     def setup_steam_config(self):
         """Configure Steam for Decky Loader"""
         print("Configuring Steam...")
@@ -665,43 +1119,71 @@ class DeckyBuilder:
         if sys.version_info.major != 3 or sys.version_info.minor != 11:
             raise Exception("This script requires Python 3.11. Please run using decky_builder.bat")
 
+    def _version(self, exe):
+        """Return a tool's --version output, memoized per resolved executable path"""
+        path = shutil.which(exe)
+        if not path:
+            raise FileNotFoundError(f"{exe} not found in PATH")
+        if path not in self._versions:
+            self._versions[path] = subprocess.run(
+                [path, "--version"], check=True, capture_output=True, text=True
+            ).stdout.strip()
+        return self._versions[path]
+
     def check_dependencies(self):
         """Check and install required dependencies"""
         print("Checking dependencies...")
         try:
-            # Check Node.js and npm first
-            try:
-                # Use shell=True to find node in PATH
-                node_version = subprocess.run("node --version", shell=True, check=True, capture_output=True, text=True).stdout.strip()
-                npm_version = subprocess.run("npm --version", shell=True, check=True, capture_output=True, text=True).stdout.strip()
-                
-                # Check if version meets requirements
-                if not node_version.startswith("v18."):
-                    print(f"Node.js {node_version} found, but v18.18.0 is required")
-                    self.install_nodejs()
-                else:
-                    print(f"Node.js {node_version} with npm {npm_version} is installed")
-
-            except Exception as e:
-                print(f"Node.js/npm not found or error: {str(e)}")
+            # Check Node.js and npm first. shutil.which resolves tools (including
+            # .cmd shims) in-process, so we only spawn them to read a version.
+            node = shutil.which("node")
+            npm = shutil.which("npm")
+            if not node or not npm:
+                print("Node.js/npm not found in PATH")
                 self.install_nodejs()
+            else:
+                try:
+                    node_version = self._version(node)
+                    npm_version = self._version(npm)
+                    
+                    # Check if version meets requirements
+                    if not node_version.startswith("v18."):
+                        print(f"Node.js {node_version} found, but v18.18.0 is required")
+                        self.install_nodejs()
+                    else:
+                        print(f"Node.js {node_version} with npm {npm_version} is installed")
 
-            # Install pnpm globally if not present
-            try:
-                pnpm_version = subprocess.run("pnpm --version", shell=True, check=True, capture_output=True, text=True).stdout.strip()
-                print(f"pnpm version {pnpm_version} is installed")
-            except:
+                except Exception as e:
+                    print(f"Node.js/npm not found or error: {str(e)}")
+                    self.install_nodejs()
+
+            # Install the pinned pnpm globally if it is missing or a different version
+            pnpm = shutil.which("pnpm")
+            if pnpm and self._version(pnpm) == PNPM_VERSION:
+                print(f"pnpm version {PNPM_VERSION} is installed")
+            else:
+                if pnpm:
+                    print(f"pnpm {self._version(pnpm)} found, but {PNPM_VERSION} is required")
                 print("Installing pnpm globally...")
-                subprocess.run("npm i -g pnpm", shell=True, check=True)
-                pnpm_version = subprocess.run("pnpm --version", shell=True, check=True, capture_output=True, text=True).stdout.strip()
-                print(f"Installed pnpm version {pnpm_version}")
+                npm = shutil.which("npm")  # May have just been installed by install_nodejs
+                if not npm:
+                    raise Exception("npm not found in PATH")
+                subprocess.run([npm, "i", "-g", f"pnpm@{PNPM_VERSION}"], check=True)
+                self._versions.clear()  # The pnpm on PATH may have changed in place
+                pnpm = shutil.which("pnpm")
+                if not pnpm:
+                    raise Exception("pnpm was installed but is not in PATH")
+                if self._version(pnpm) != PNPM_VERSION:
+                    # e.g. a standalone or corepack pnpm ahead of npm's global bin on PATH
+                    print(f"Warning: {pnpm} still reports pnpm {self._version(pnpm)}, not {PNPM_VERSION}")
+                else:
+                    print(f"Installed pnpm@{PNPM_VERSION}")
 
             # Check git
-            try:
-                git_version = subprocess.run("git --version", shell=True, check=True, capture_output=True, text=True).stdout.strip()
-                print(f"{git_version} is installed")
-            except:
+            git = shutil.which("git")
+            if not git:
                 raise Exception("git is not installed. Please install git from https://git-scm.com/downloads")
+            print(f"{self._version(git)} is installed")
 
             print("All dependencies are satisfied")
         except Exception as e:
@@ -789,15 +1271,28 @@ class DeckyBuilder:
         try:
             print("Starting Decky Loader build process...")
             self.check_python_version()
-            self.check_dependencies()
             self.setup_directories()
-            self.clone_repository()
-            self.setup_homebrew()
-            self.build_frontend()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                # Node.js/pnpm setup, the git clone and pip install are all
+                # network-bound, so overlap them
+                dependencies = executor.submit(self.check_dependencies)
+                clone = executor.submit(self.clone_repository)
+                self.setup_homebrew()
+                clone.result()
+                # pip install only needs the cloned tree, start it without
+                # waiting for Node.js and let it overlap the frontend build
+                requirements = executor.submit(self.install_requirements)
+                dependencies.result()
+                self.build_frontend()
+                requirements.result()
             self.prepare_backend()
-            self.install_requirements()
             self.build_executables()
             self.install_files()
+            self.artifacts_installed = True
+            # Git checkouts and complete tarball extractions can be reused by the
+            # next build; anything else is deleted in the background now
+            if not (self.app_dir / ".git").exists() and not self.release_manifest.exists():
+                self._async_rmtree(self.app_dir)
             self.setup_steam_config()
             self.setup_autostart()
             print("\nBuild process completed successfully!")
@@ -809,8 +1304,6 @@ class DeckyBuilder:
         except Exception as e:
             print(f"Error during build process: {str(e)}")
             raise
-        finally:
-            self.cleanup()
 
 def main():
     parser = argparse.ArgumentParser(description='Build and Install Decky Loader for Windows')
@@ -819,8 +1312,8 @@ def main():
     args = parser.parse_args()
 
     try:
-        builder = DeckyBuilder(args.release)
-        builder.run()
+        with DeckyBuilder(args.release) as builder:
+            builder.run()
         print(f"\nDecky Loader has been installed to: {builder.user_homebrew_dir}")
     except Exception as e:
         print(f"Error during build process: {str(e)}")